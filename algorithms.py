@@ -1,341 +1,342 @@
 import pygame
 import pygame_gui # Import for processing events during pause
-from collections import deque
-import heapq
-# Removed from queue import PriorityQueue as we are directly using heapq for A*
-from utils.heuristics import h
+from utils.search_core import bfs_core, dfs_core, dijkstra_core, astar_core, bidir_astar_core, reconstruct_path_indices
+try:
+    # C versions of the bucket-queue cores, only present once built with setup.py
+    from utils.search_core_c import dijkstra_core, astar_core
+except ImportError:
+    pass
+
+# --- Search Driver ---
+FRAME_RATE = 60 # Upper bound on animation frames per second during a search
+PATH_BATCH = 16 # Path nodes colored per frame when the found path is drawn
+PATH_DELAY_MS = 10 # Minimum duration in milliseconds of a path animation frame
+
+def apply_event(event):
+    """
+    Applies a single search event to the node it refers to.
+
+    Args:
+        event (tuple): A (kind, node) pair where kind is "open" or "closed".
+    """
+    kind, node = event
+    if kind == "open":
+        node.make_open()
+    elif kind == "closed":
+        node.make_closed()
 
-def reconstruct_path(came_from, current, draw_func):
+def frame_rate_for(delay_ms):
     """
-    Reconstructs the path from the end node back to the start node
-    and marks path nodes for visualization.
-    
+    Converts a per-frame delay into a frame rate for Clock.tick.
+
     Args:
-        came_from (dict): A dictionary mapping a node to the node that preceded it in the shortest path.
-        current (Node): The current node, starting from the end node.
-        draw_func (function): A function to call for updating the visual display.
-    
+        delay_ms (int): Minimum duration in milliseconds of an animation frame.
+
     Returns:
-        list: A list of nodes forming the reconstructed path (excluding the start node).
+        int: Frames per second, between 1 and FRAME_RATE.
     """
-    path_nodes = []
-    while current in came_from:
-        current = came_from[current]
-        if not current.is_start():
-            path_nodes.append(current)
-            current.make_path()
-        draw_func() # Only draws grid and calls pygame.display.update()
-        pygame.time.delay(10) # Small delay for visual effect
-    return path_nodes
+    return max(1, min(FRAME_RATE, int(1000 // delay_ms))) if delay_ms > 0 else FRAME_RATE
 
-# --- BFS Algorithm ---
-def bfs(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface):
+def process_frame_events(manager, on_gui_event=None, deferred=None):
     """
-    Performs Breadth-First Search (BFS) to find the shortest path.
+    Drains the event queue once for the current animation frame and hands
+    every event to the GUI manager.
+
+    Events the GUI did not consume go to on_gui_event, which acts on the ones
+    that matter during a search (the pause button). The rest are kept in
+    `deferred` for the main loop: button presses such as Clear Path and clicks
+    on the grid are then handled once the search is over. Mouse motion is
+    dropped, since the main loop polls the mouse position itself.
+
+    Args:
+        manager (pygame_gui.UIManager): The GUI manager for processing events.
+        on_gui_event (function, optional): Called with each event the GUI did not
+            consume, including the events it posts for button presses; returns
+            True if it handled the event.
+        deferred (list, optional): Collects the events to post back after the search.
+
+    Returns:
+        bool: False if the user closed the window, True otherwise.
+    """
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            pygame.event.post(event) # Leave it for the main loop so the app still quits
+            return False
+        if manager.process_events(event) or event.type == pygame.MOUSEMOTION:
+            continue
+        if on_gui_event is not None and on_gui_event(event):
+            continue
+        if deferred is not None:
+            deferred.append(event)
+    return True
+
+def wait_while_paused(draw_func, paused_ref, manager, window_surface, on_gui_event=None, deferred=None):
+    """
+    Keeps the app responsive while a search is paused. on_gui_event has to
+    clear paused_ref when the user resumes.
 
     Args:
         draw_func (function): Function to draw the grid and update the display.
-        grid (list[list[Node]]): The 2D grid of nodes.
-        start (Node): The starting node.
-        end (Node): The target end node.
-        delay_ms (int): Delay in milliseconds between node explorations for visualization.
         paused_ref (list): A mutable reference ([boolean]) to control pause state.
         manager (pygame_gui.UIManager): The GUI manager for processing events.
         window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        on_gui_event (function, optional): Handler for GUI events, see process_frame_events.
+        deferred (list, optional): Collects the events to post back after the search.
 
     Returns:
-        tuple: (found_path_boolean, visited_nodes_count, path_length)
+        bool: False if the user closed the window while paused, True otherwise.
     """
-    queue = deque()
-    queue.append(start)
-    visited = {start}
-    came_from = {}
-    
-    visited_nodes_count = 0
-
-    while queue:
-        # --- Handle Pause and Quit Events ---
-        if paused_ref[0]: # Check if paused
-            while paused_ref[0]:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return False, visited_nodes_count, 0 # Return interrupted status
-                    manager.process_events(event) # Process GUI events even when paused
-                
-                # Draw grid and UI while paused to keep app responsive
-                draw_func() # This draws the grid and calls pygame.display.update()
-                manager.update(0.01) # Update GUI elements for the pause frame
-                manager.draw_ui(window_surface) # Draw GUI elements
-                pygame.display.flip() # Update the entire display for pause frame
-                
-                pygame.time.wait(50) # Small wait to prevent 100% CPU usage while paused
-        
-        current = queue.popleft()
-
-        if current == end:
-            path_nodes = reconstruct_path(came_from, end, draw_func)
-            end.make_end()
-            start.make_start()
-            return True, visited_nodes_count, len(path_nodes) + 1
-
-        for neighbor in current.neighbors:
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
-                queue.append(neighbor)
-                if neighbor != end:
-                    neighbor.make_open()
-        
-        if current != start and current != end:
-            current.make_closed()
-            visited_nodes_count += 1
+    while paused_ref[0]:
+        if not process_frame_events(manager, on_gui_event, deferred): # Process GUI events even when paused
+            return False
 
-        draw_func() # Update visualization after exploring a node's neighbors
-        pygame.time.delay(delay_ms) # Use the passed delay
+        # Draw grid and UI while paused to keep app responsive
+        draw_func() # This draws the grid and calls pygame.display.update()
+        manager.update(0.01) # Update GUI elements for the pause frame
+        manager.draw_ui(window_surface) # Draw GUI elements
+        pygame.display.flip() # Update the entire display for pause frame
 
-    return False, visited_nodes_count, 0
+        pygame.time.wait(50) # Small wait to prevent 100% CPU usage while paused
+    return True
 
-# --- DFS Algorithm ---
-def dfs(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface):
+def run_search(gen, draw_func, delay_ms, paused_ref, manager, window_surface, batch=64, on_gui_event=None):
     """
-    Performs Depth-First Search (DFS) to find a path.
+    Consumes the events of a search generator and animates them.
+    Node colors are updated for every event, but the display is only redrawn,
+    the window events polled and the pause state checked once per `batch`
+    search steps (expanded, i.e. closed, nodes). Frames are paced with a Clock
+    so that each one lasts at least `batch * delay_ms` milliseconds, capped at
+    FRAME_RATE frames per second.
+
+    Once the search is over, a found path is drawn by animate_path, and the
+    window events the search did not act on are posted back to the queue.
 
     Args:
+        gen (generator): A search generator yielding (kind, node) events and
+            returning (found_path_boolean, path_nodes) when exhausted.
         draw_func (function): Function to draw the grid and update the display.
-        grid (list[list[Node]]): The 2D grid of nodes.
-        start (Node): The starting node.
-        end (Node): The target end node.
-        delay_ms (int): Delay in milliseconds between node explorations for visualization.
+        delay_ms (int): Delay in milliseconds per search step.
         paused_ref (list): A mutable reference ([boolean]) to control pause state.
         manager (pygame_gui.UIManager): The GUI manager for processing events.
         window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        batch (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the
+            search, e.g. the pause button; see process_frame_events.
 
     Returns:
         tuple: (found_path_boolean, visited_nodes_count, path_length)
     """
-    stack = [start]
-    visited = {start}
-    came_from = {}
-    
-    visited_nodes_count = 0
-
-    while stack:
-        # --- Handle Pause and Quit Events ---
-        if paused_ref[0]:
-            while paused_ref[0]:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return False, visited_nodes_count, 0
-                    manager.process_events(event)
-                draw_func()
-                manager.update(0.01)
-                manager.draw_ui(window_surface)
-                pygame.display.flip()
-                pygame.time.wait(50)
-
-        current = stack.pop()
-
-        if current == end:
-            path_nodes = reconstruct_path(came_from, end, draw_func)
-            end.make_end()
-            start.make_start()
-            return True, visited_nodes_count, len(path_nodes) + 1
-
-        # Only mark as closed if it's not start or end and we haven't already processed it
-        # The check for current != start and current != end is applied AFTER checking if current is end
-        if current != start and current != end:
-            current.make_closed()
+    deferred = [] # Events left for the main loop
+    try:
+        visited_nodes_count = 0
+        pending = 0
+        clock = pygame.time.Clock()
+        frame_rate = frame_rate_for(batch * delay_ms)
+
+        while True:
+            try:
+                event = next(gen)
+            except StopIteration as stop:
+                found, path = stop.value
+                break
+
+            apply_event(event)
+            if event[0] != "closed":
+                continue
             visited_nodes_count += 1
 
+            pending += 1
+            if pending >= batch:
+                pending = 0
+                draw_func()
+                if not (process_frame_events(manager, on_gui_event, deferred)
+                        and wait_while_paused(draw_func, paused_ref, manager, window_surface, on_gui_event, deferred)):
+                    gen.close()
+                    return False, visited_nodes_count, 0 # Return interrupted status
+                clock.tick(frame_rate)
+
+        draw_func() # Show the events of the last (partial) batch
+        if not found:
+            return False, visited_nodes_count, 0
+        if not animate_path(path, draw_func, paused_ref, manager, window_surface,
+                            on_gui_event=on_gui_event, deferred=deferred):
+            return False, visited_nodes_count, 0 # Return interrupted status
+        return True, visited_nodes_count, len(path) + 1
+    finally:
+        for event in deferred:
+            pygame.event.post(event)
+
+def animate_path(path, draw_func, paused_ref, manager, window_surface,
+                 batch=PATH_BATCH, delay_ms=PATH_DELAY_MS, on_gui_event=None, deferred=None):
+    """
+    Colors the nodes of a found path, `batch` nodes per animation frame.
+
+    Args:
+        path (list[Node]): The path nodes, starting next to the end node.
+        draw_func (function): Function to draw the grid and update the display.
+        paused_ref (list): A mutable reference ([boolean]) to control pause state.
+        manager (pygame_gui.UIManager): The GUI manager for processing events.
+        window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        batch (int): Number of path nodes colored per animation frame.
+        delay_ms (int): Minimum duration in milliseconds of an animation frame.
+        on_gui_event (function, optional): Handler for GUI events, see process_frame_events.
+        deferred (list, optional): Collects the events to post back after the animation.
+
+    Returns:
+        bool: False if the user closed the window during the animation, True otherwise.
+    """
+    clock = pygame.time.Clock()
+    frame_rate = frame_rate_for(delay_ms)
+    for i in range(0, len(path), batch):
+        for node in path[i:i + batch]:
+            node.make_path()
         draw_func()
-        pygame.time.delay(delay_ms)
+        if not (process_frame_events(manager, on_gui_event, deferred)
+                and wait_while_paused(draw_func, paused_ref, manager, window_surface, on_gui_event, deferred)):
+            return False
+        clock.tick(frame_rate)
+    return True
 
-        # Iterate in reverse to push neighbors, making the "leftmost" or "first" neighbor
-        # explored first when popped from stack (typical DFS behavior for visualization)
-        for neighbor in reversed(current.neighbors): 
-            if neighbor not in visited and not neighbor.is_barrier():
-                visited.add(neighbor)
-                came_from[neighbor] = current
-                stack.append(neighbor)
-                if neighbor != end:
-                    neighbor.make_open()
+def _search_steps(core, grid, start, end):
+    """
+    Runs a search core on the integer view of the grid and yields its events
+    as (kind, node) pairs.
 
-    return False, visited_nodes_count, 0
+    The core runs to completion before the first event is yielded: on the
+    app's grid it takes a few milliseconds, far less than one animation frame.
 
+    Args:
+        core (function): One of the search cores from utils.search_core.
+        grid (Grid): The grid to search, with an up-to-date neighbor table.
+        start (Node): The starting node.
+        end (Node): The target end node.
 
-# --- Dijkstra's Algorithm ---
-def dijkstra(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface):
+    Returns:
+        tuple: (found_path_boolean, path_nodes), path_nodes starting next to the end node.
     """
-    Performs Dijkstra's Algorithm to find the shortest path.
+    nodes = grid.flat_nodes
+    start_idx = start._idx
+    end_idx = end._idx
+    found, came_from, events = core(grid.adj, start_idx, end_idx, grid.rows)
+
+    for kind, idx in events:
+        yield (kind, nodes[idx])
+    if not found:
+        return False, []
+
+    # The whole path is collected before any of it is drawn
+    return True, [nodes[idx] for idx in reconstruct_path_indices(came_from, start_idx, end_idx)]
+
+# --- BFS Algorithm ---
+def bfs(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface, steps_per_frame=64, on_gui_event=None):
+    """
+    Performs Breadth-First Search (BFS) to find the shortest path.
 
     Args:
         draw_func (function): Function to draw the grid and update the display.
-        grid (list[list[Node]]): The 2D grid of nodes.
+        grid (Grid): The grid to search; its neighbor table follows barrier edits.
         start (Node): The starting node.
         end (Node): The target end node.
-        delay_ms (int): Delay in milliseconds between node explorations for visualization.
+        delay_ms (int): Delay in milliseconds per search step.
         paused_ref (list): A mutable reference ([boolean]) to control pause state.
         manager (pygame_gui.UIManager): The GUI manager for processing events.
         window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        steps_per_frame (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the search, e.g. the pause button.
 
     Returns:
         tuple: (found_path_boolean, visited_nodes_count, path_length)
     """
-    g_score = {node: float("inf") for row in grid for node in row}
-    g_score[start] = 0
-
-    count = 0
-    # Priority Queue stores (g_score, tie_breaker, node)
-    open_set = [(0, count, start)] 
-
-    came_from = {}
-    
-    # To quickly check if a node is in the open_set without iterating the heap
-    open_set_hash = {start} 
-    
-    visited_nodes_count = 0
-
-    while open_set:
-        # --- Handle Pause and Quit Events ---
-        if paused_ref[0]:
-            while paused_ref[0]:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return False, visited_nodes_count, 0
-                    manager.process_events(event)
-                draw_func()
-                manager.update(0.01)
-                manager.draw_ui(window_surface)
-                pygame.display.flip()
-                pygame.time.wait(50)
+    return run_search(_search_steps(bfs_core, grid, start, end), draw_func, delay_ms, paused_ref, manager, window_surface, batch=steps_per_frame, on_gui_event=on_gui_event)
 
-        # Pop the node with the smallest g_score
-        current_g_score, tie_breaker, current = heapq.heappop(open_set)
-        open_set_hash.remove(current)
+# --- DFS Algorithm ---
+def dfs(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface, steps_per_frame=64, on_gui_event=None):
+    """
+    Performs Depth-First Search (DFS) to find a path.
 
-        # If we already found a shorter path to this node, skip
-        if current_g_score > g_score[current]:
-            continue
+    Args:
+        draw_func (function): Function to draw the grid and update the display.
+        grid (Grid): The grid to search; its neighbor table follows barrier edits.
+        start (Node): The starting node.
+        end (Node): The target end node.
+        delay_ms (int): Delay in milliseconds per search step.
+        paused_ref (list): A mutable reference ([boolean]) to control pause state.
+        manager (pygame_gui.UIManager): The GUI manager for processing events.
+        window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        steps_per_frame (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the search, e.g. the pause button.
 
-        if current == end:
-            path_nodes = reconstruct_path(came_from, end, draw_func)
-            end.make_end()
-            start.make_start()
-            return True, visited_nodes_count, len(path_nodes) + 1
+    Returns:
+        tuple: (found_path_boolean, visited_nodes_count, path_length)
+    """
+    return run_search(_search_steps(dfs_core, grid, start, end), draw_func, delay_ms, paused_ref, manager, window_surface, batch=steps_per_frame, on_gui_event=on_gui_event)
 
-        for neighbor in current.neighbors:
-            if neighbor.is_barrier():
-                continue
 
-            temp_g_score = g_score[current] + 1 # Cost to move to neighbor is 1
-
-            if temp_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                
-                if neighbor not in open_set_hash:
-                    count += 1 # Tie-breaker for nodes with same g_score
-                    heapq.heappush(open_set, (g_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    if neighbor != end:
-                        neighbor.make_open()
-        
-        if current != start and current != end:
-            current.make_closed()
-            visited_nodes_count += 1
+# --- Dijkstra's Algorithm ---
+def dijkstra(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface, steps_per_frame=64, on_gui_event=None):
+    """
+    Performs Dijkstra's Algorithm to find the shortest path.
 
-        draw_func()
-        pygame.time.delay(delay_ms)
+    Args:
+        draw_func (function): Function to draw the grid and update the display.
+        grid (Grid): The grid to search; its neighbor table follows barrier edits.
+        start (Node): The starting node.
+        end (Node): The target end node.
+        delay_ms (int): Delay in milliseconds per search step.
+        paused_ref (list): A mutable reference ([boolean]) to control pause state.
+        manager (pygame_gui.UIManager): The GUI manager for processing events.
+        window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        steps_per_frame (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the search, e.g. the pause button.
 
-    return False, visited_nodes_count, 0
+    Returns:
+        tuple: (found_path_boolean, visited_nodes_count, path_length)
+    """
+    return run_search(_search_steps(dijkstra_core, grid, start, end), draw_func, delay_ms, paused_ref, manager, window_surface, batch=steps_per_frame, on_gui_event=on_gui_event)
 
 
 # --- A* Search Algorithm ---
-def astar(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface):
+def astar(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface, steps_per_frame=64, on_gui_event=None):
     """
     Performs A* Search Algorithm to find the shortest path using a heuristic.
 
     Args:
         draw_func (function): Function to draw the grid and update the display.
-        grid (list[list[Node]]): The 2D grid of nodes.
+        grid (Grid): The grid to search; its neighbor table follows barrier edits.
         start (Node): The starting node.
         end (Node): The target end node.
-        delay_ms (int): Delay in milliseconds between node explorations for visualization.
+        delay_ms (int): Delay in milliseconds per search step.
         paused_ref (list): A mutable reference ([boolean]) to control pause state.
         manager (pygame_gui.UIManager): The GUI manager for processing events.
         window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        steps_per_frame (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the search, e.g. the pause button.
 
     Returns:
         tuple: (found_path_boolean, visited_nodes_count, path_length)
     """
-    count = 0
-    # Using heapq directly for better performance than queue.PriorityQueue for this use case
-    open_set = [] # Stores (f_score, tie-breaker, node)
-    heapq.heappush(open_set, (0, count, start)) 
-    
-    came_from = {}
-
-    g_score = {node: float("inf") for row in grid for node in row}
-    g_score[start] = 0
-    f_score = {node: float("inf") for row in grid for node in row}
-    # f_score = g_score + h(node, end)
-    f_score[start] = h(start.get_pos(), end.get_pos(), method="manhattan")
-
-    # To quickly check if a node is already in the open_set
-    open_set_hash = {start} 
-    visited_nodes_count = 0
-
-    while open_set: # While heap is not empty
-        # --- Handle Pause and Quit Events ---
-        if paused_ref[0]:
-            while paused_ref[0]:
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        return False, visited_nodes_count, 0
-                    manager.process_events(event)
-                draw_func()
-                manager.update(0.01)
-                manager.draw_ui(window_surface)
-                pygame.display.flip()
-                pygame.time.wait(50)
-
-        # Pop the node with the smallest f_score
-        current_f_score, tie_breaker, current = heapq.heappop(open_set)
-        open_set_hash.remove(current)
-
-        # If we already processed this node with a better (or equal) f_score, skip
-        if current_f_score > f_score[current]:
-            continue
-
-        if current == end:
-            path_nodes = reconstruct_path(came_from, end, draw_func)
-            end.make_end()
-            start.make_start()
-            return True, visited_nodes_count, len(path_nodes) + 1
+    return run_search(_search_steps(astar_core, grid, start, end), draw_func, delay_ms, paused_ref, manager, window_surface, batch=steps_per_frame, on_gui_event=on_gui_event)
 
-        for neighbor in current.neighbors:
-            if neighbor.is_barrier():
-                continue
 
-            temp_g_score = g_score[current] + 1 # Cost to move from current to neighbor is 1
-
-            if temp_g_score < g_score[neighbor]: # Found a shorter path to neighbor
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g_score
-                f_score[neighbor] = temp_g_score + h(neighbor.get_pos(), end.get_pos(), method="manhattan")
-
-                if neighbor not in open_set_hash:
-                    count += 1 # Tie-breaker for nodes with same f_score
-                    heapq.heappush(open_set, (f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-                    if neighbor != end:
-                        neighbor.make_open()
-        
-        if current != start and current != end:
-            current.make_closed()
-            visited_nodes_count += 1
+# --- Bidirectional A* Search Algorithm ---
+def bidir_astar(draw_func, grid, start, end, delay_ms, paused_ref, manager, window_surface, steps_per_frame=64, on_gui_event=None):
+    """
+    Performs Bidirectional A* Search, expanding from both the start and the end node
+    until the two searches meet, to find the shortest path.
 
-        draw_func()
-        pygame.time.delay(delay_ms)
+    Args:
+        draw_func (function): Function to draw the grid and update the display.
+        grid (Grid): The grid to search; its neighbor table follows barrier edits.
+        start (Node): The starting node.
+        end (Node): The target end node.
+        delay_ms (int): Delay in milliseconds per search step.
+        paused_ref (list): A mutable reference ([boolean]) to control pause state.
+        manager (pygame_gui.UIManager): The GUI manager for processing events.
+        window_surface (pygame.Surface): The main window surface for drawing GUI elements during pause.
+        steps_per_frame (int): Number of search steps shown per animation frame.
+        on_gui_event (function, optional): Handler for GUI events during the search, e.g. the pause button.
 
-    return False, visited_nodes_count, 0
\ No newline at end of file
+    Returns:
+        tuple: (found_path_boolean, visited_nodes_count, path_length)
+    """
+    return run_search(_search_steps(bidir_astar_core, grid, start, end), draw_func, delay_ms, paused_ref, manager, window_surface, batch=steps_per_frame, on_gui_event=on_gui_event)
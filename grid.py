@@ -10,12 +10,24 @@ ORANGE = (255, 165, 0)    # Start node
 GREY = (128, 128, 128)    # Grid lines
 TURQUOISE = (64, 224, 208) # End node
 
+# Node states as stored in Grid.colors (one byte per node)
+EMPTY, START, END, BARRIER, CLOSED, OPEN, PATH = range(7)
+NODE_COLORS = (WHITE, ORANGE, TURQUOISE, BLACK, RED, GREEN, PURPLE) # Indexed by state
+
+# bytes.translate table over Grid.colors, applied in a single C-level pass
+CLEAR_TABLE = bytes(EMPTY if code in (CLOSED, OPEN, PATH) else code for code in range(256))
+
 
 class Node:
     """
     Represents a single node (square) in the grid for pathfinding.
     """
-    def __init__(self, row, col, size, total_rows):
+    # A grid holds thousands of nodes: slots keep them small and their attribute
+    # reads fast. color is a property over Grid.colors, so it has no slot.
+    __slots__ = ("row", "col", "x", "y", "neighbors", "size", "total_rows",
+                 "_grid", "_colors", "_barriers", "_idx")
+
+    def __init__(self, row, col, size, total_rows, grid):
         """
         Initializes a Node object.
 
@@ -24,16 +36,25 @@ class Node:
             col (int): The column index of the node in the grid.
             size (int): The pixel size of one side of the square node.
             total_rows (int): The total number of rows in the grid.
+            grid (Grid): The grid owning this node; it stores the node's state.
         """
         self.row = row
         self.col = col
         # In Pygame, (0,0) is top-left. x corresponds to col, y corresponds to row.
         self.x = col * size
         self.y = row * size
-        self.color = WHITE # Default color
         self.neighbors = [] # List to store valid neighbors for pathfinding
         self.size = size # Size of the node (square)
         self.total_rows = total_rows # Total rows in the grid
+        self._grid = grid # Owning grid, collects nodes that need redrawing
+        self._colors = grid.colors # The node's state lives in the grid's flat state array
+        self._barriers = grid.barriers # Barrier flag of every node, kept in sync by _set_state
+        self._idx = row * total_rows + col # Position of the node in that array
+
+    @property
+    def color(self):
+        """The RGB color of the node, derived from its state in Grid.colors."""
+        return NODE_COLORS[self._colors[self._idx]]
 
     def get_pos(self):
         """Returns the (row, col) position of the node."""
@@ -41,51 +62,60 @@ class Node:
 
     def is_closed(self):
         """Checks if the node is a closed (visited) node."""
-        return self.color == RED
+        return self._colors[self._idx] == CLOSED
 
     def is_open(self):
         """Checks if the node is an open node (in consideration by algorithm)."""
-        return self.color == GREEN
+        return self._colors[self._idx] == OPEN
 
     def is_barrier(self):
         """Checks if the node is a barrier."""
-        return self.color == BLACK
+        return self._barriers[self._idx] == 1
 
     def is_start(self):
         """Checks if the node is the start node."""
-        return self.color == ORANGE
+        return self._colors[self._idx] == START
 
     def is_end(self):
         """Checks if the node is the end node."""
-        return self.color == TURQUOISE
+        return self._colors[self._idx] == END
+
+    def _set_state(self, state):
+        """Sets the node's state and marks it for redrawing on the owning grid."""
+        self._colors[self._idx] = state
+        barrier = state == BARRIER
+        if self._barriers[self._idx] != barrier:
+            self._barriers[self._idx] = barrier
+            self._grid.update_neighbors_around(self) # Only the adjacent nodes can see the change
+        self._grid.dirty.add(self)
 
     def reset(self):
         """Resets the node's color to default (white)."""
-        self.color = WHITE
+        self._set_state(EMPTY)
 
     def make_start(self):
         """Sets the node's color to represent a start node."""
-        self.color = ORANGE
+        self._set_state(START)
 
     def make_closed(self):
         """Sets the node's color to represent a closed (visited) node."""
-        self.color = RED
+        self._set_state(CLOSED)
 
     def make_open(self):
         """Sets the node's color to represent an open node."""
-        self.color = GREEN
+        self._set_state(OPEN)
 
     def make_barrier(self):
         """Sets the node's color to represent a barrier."""
-        self.color = BLACK
+        self._set_state(BARRIER)
 
     def make_end(self):
         """Sets the node's color to represent an end node."""
-        self.color = TURQUOISE
+        self._set_state(END)
 
     def make_path(self):
         """Sets the node's color to represent a path node."""
-        self.color = PURPLE
+        self._set_state(PATH)
 
     def draw(self, win):
         """
@@ -94,40 +124,36 @@ class Node:
         Args:
             win (pygame.Surface): The surface to draw the node on.
         """
-        pygame.draw.rect(win, self.color, (self.x, self.y, self.size, self.size))
+        win.fill(self.color, (self.x, self.y, self.size, self.size))
 
-    def update_neighbors(self, grid):
+    def update_neighbors(self, nodes):
         """
         Updates the list of valid (non-barrier) neighbors for this node.
 
         Args:
-            grid (list[list[Node]]): The 2D grid of nodes.
+            nodes (list[Node]): All nodes of the grid in row-major order (see Grid.flat_nodes).
         """
-        self.neighbors = []
+        # Bind everything the checks touch to locals once; barrier tests read
+        # the flat barrier plane directly instead of going through is_barrier()
+        barriers, idx, rows = self._barriers, self._idx, self.total_rows
+        row, col, last = self.row, self.col, rows - 1
+        neighbors = []
         # Check Down neighbor
-        if self.row < self.total_rows - 1 and not grid[self.row + 1][self.col].is_barrier():
-            self.neighbors.append(grid[self.row + 1][self.col])
+        if row < last and not barriers[idx + rows]:
+            neighbors.append(nodes[idx + rows])
 
         # Check Up neighbor
-        if self.row > 0 and not grid[self.row - 1][self.col].is_barrier():
-            self.neighbors.append(grid[self.row - 1][self.col])
+        if row > 0 and not barriers[idx - rows]:
+            neighbors.append(nodes[idx - rows])
 
         # Check Right neighbor
-        if self.col < self.total_rows - 1 and not grid[self.row][self.col + 1].is_barrier():
-            self.neighbors.append(grid[self.row][self.col + 1])
+        if col < last and not barriers[idx + 1]:
+            neighbors.append(nodes[idx + 1])
 
         # Check Left neighbor
-        if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():
-            self.neighbors.append(grid[self.row][self.col - 1])
-
-    def __lt__(self, other):
-        """
-        This method is required for Node objects to be compared in a PriorityQueue or heapq.
-        It's a placeholder, as actual comparison should be based on f_score/g_score,
-        which are handled by the tuple in the priority queue (e.g., (f_score, count, node)).
-        Returns False to indicate that no inherent ordering exists for Node objects themselves.
-        """
-        return False
+        if col > 0 and not barriers[idx - 1]:
+            neighbors.append(nodes[idx - 1])
+        self.neighbors = neighbors
 
 
 class Grid:
@@ -145,7 +171,18 @@ class Grid:
         self.rows = rows
         self.width = width # This is the width of the grid drawing area
         self.gap = self.width // self.rows # Calculate gap (size of each node)
+        self.colors = bytearray(self.rows * self.rows) # State of every node (EMPTY, START, ...)
+        self.barriers = bytearray(self.rows * self.rows) # 1 for barrier nodes, updated by the node setters
+        self.dirty = set() # Nodes whose color changed since the last draw
         self.grid_nodes = self.make_grid()
+        self.flat_nodes = [node for row in self.grid_nodes for node in row] # Indexed by Node._idx
+        self.dirty.update(self.flat_nodes) # Nothing of a new grid has been drawn yet
+        self.tiles = self.make_tiles() # Pre-rendered node square per state, for Surface.blits
+        # Walkable neighbor indices per node, indexed by row * rows + col, for
+        # the search cores. Built once here, then kept up to date by the node
+        # setters whenever a barrier is placed or removed.
+        self.adj = [()] * (self.rows * self.rows)
+        self.rebuild_neighbors()
 
     def make_grid(self):
         """
@@ -158,28 +195,83 @@ class Grid:
         for i in range(self.rows):
             grid.append([])
             for j in range(self.rows):
-                node = Node(i, j, self.gap, self.rows)
+                node = Node(i, j, self.gap, self.rows, self)
                 grid[i].append(node)
         return grid
 
-    def draw(self, win):
+    def make_tiles(self):
+        """
+        Pre-renders the square of a node in every state: the state's color with
+        the grid lines along its top and left edges, as a full draw shows it.
+
+        Returns:
+            list[pygame.Surface]: One tile per node state, indexed by state.
+        """
+        tiles = []
+        last = self.gap - 1
+        for color in NODE_COLORS:
+            tile = pygame.Surface((self.gap, self.gap))
+            tile.fill(color)
+            pygame.draw.line(tile, GREY, (0, 0), (last, 0))
+            pygame.draw.line(tile, GREY, (0, 0), (0, last))
+            tiles.append(tile)
+        return tiles
+
+    def draw(self, win, partial=False):
         """
         Draws all nodes in the grid and then draws the grid lines on top.
+        With partial=True only the nodes whose color changed since the last
+        draw are redrawn.
 
         Args:
             win (pygame.Surface): The surface to draw the grid on.
+            partial (bool): Redraw only the dirty nodes.
+
+        Returns:
+            list[pygame.Rect]: The areas of the surface that were drawn.
         """
-        # Draw each node
-        for row in self.grid_nodes:
-            for node in row:
-                node.draw(win)
-        
-        # Draw grid lines on top of nodes
+        tiles, colors, gap = self.tiles, self.colors, self.gap
+        if partial:
+            # Each dirty node is redrawn, grid lines included, by blitting the
+            # tile of its state; all of them go to the surface in one call
+            dirty = self.dirty
+            win.blits([(tiles[colors[node._idx]], (node.x, node.y)) for node in dirty], doreturn=False)
+            rects = [pygame.Rect(node.x, node.y, gap, gap) for node in dirty]
+            dirty.clear()
+            return rects
+
+        # Blit the tile of every node in a single call
+        row_of = [row * gap for row in range(self.rows) for _ in range(self.rows)]
+        col_of = [col * gap for col in range(self.rows)] * self.rows
+        win.blits([(tiles[state], (x, y)) for state, x, y in zip(colors, col_of, row_of)], doreturn=False)
+
+        # Draw grid lines over the whole drawing area, which can be wider than the nodes.
+        # Lock once for all of them instead of once per line (not around the blits
+        # above: a locked surface cannot be blitted to)
+        win.lock()
         for i in range(self.rows):
             # Draw horizontal lines: (start_x, start_y) to (end_x, end_y)
             pygame.draw.line(win, GREY, (0, i * self.gap), (self.width, i * self.gap))
             # Draw vertical lines: (start_x, start_y) to (end_x, end_y)
             pygame.draw.line(win, GREY, (i * self.gap, 0), (i * self.gap, self.width))
+        win.unlock()
+
+        self.dirty.clear()
+        return [pygame.Rect(0, 0, self.width, self.width)]
+
+    def mark_dirty_area(self, rect):
+        """
+        Marks every node overlapping the given pixel area for redrawing.
+
+        Args:
+            rect (pygame.Rect): The area, in grid surface coordinates.
+        """
+        first_row = max(rect.top // self.gap, 0)
+        last_row = min((rect.bottom - 1) // self.gap, self.rows - 1)
+        first_col = max(rect.left // self.gap, 0)
+        last_col = min((rect.right - 1) // self.gap, self.rows - 1)
+        for row in range(first_row, last_row + 1):
+            self.dirty.update(self.grid_nodes[row][first_col:last_col + 1])
 
     def get_node(self, row, col):
         """
@@ -192,7 +284,7 @@ class Grid:
         Returns:
             Node: The node at the given coordinates.
         """
-        return self.grid_nodes[row][col]
+        return self.flat_nodes[row * self.rows + col]
 
     def get_clicked_pos(self, pos):
         """
@@ -209,14 +301,62 @@ class Grid:
         col = x // self.gap
         return row, col
 
-    def update_all_neighbors(self):
+    def rebuild_neighbors(self):
+        """
+        Recomputes the neighbors list of every node in the grid, along with the
+        flat neighbor table used by the search cores.
+        Barrier changes made through the node setters are applied as they
+        happen (see update_neighbors_around), so this is only needed after
+        writing Grid.barriers directly.
         """
-        Updates the neighbors list for every node in the grid.
-        This should be called after modifying barriers.
+        flat_nodes = self.flat_nodes
+        for node in flat_nodes:
+            node.update_neighbors(flat_nodes) # Pass the flat node list for neighbor calculation
+
+        rows = self.rows
+        last = rows - 1
+        barriers = self.barriers
+        adj = []
+        add_neighbors = adj.append
+        for idx in range(rows * rows):
+            row, col = divmod(idx, rows)
+            neighbors = []
+            # Same order as Node.update_neighbors: down, up, right, left
+            if row < last and not barriers[idx + rows]:
+                neighbors.append(idx + rows)
+            if row > 0 and not barriers[idx - rows]:
+                neighbors.append(idx - rows)
+            if col < last and not barriers[idx + 1]:
+                neighbors.append(idx + 1)
+            if col > 0 and not barriers[idx - 1]:
+                neighbors.append(idx - 1)
+            add_neighbors(tuple(neighbors))
+        self.adj = adj
+
+    def update_neighbors_around(self, node):
+        """
+        Updates the neighbors of the up to four nodes adjacent to the given
+        one, after it became or stopped being a barrier.
+
+        Args:
+            node (Node): The node whose barrier state changed.
         """
-        for row in self.grid_nodes:
-            for node in row:
-                node.update_neighbors(self.grid_nodes) # Pass the entire grid_nodes for neighbor calculation
+        flat_nodes, adj = self.flat_nodes, self.adj
+        rows, idx = self.rows, node._idx
+        last = rows - 1
+        around = []
+        if node.row < last:
+            around.append(idx + rows)
+        if node.row > 0:
+            around.append(idx - rows)
+        if node.col < last:
+            around.append(idx + 1)
+        if node.col > 0:
+            around.append(idx - 1)
+        for other_idx in around:
+            other = flat_nodes[other_idx]
+            other.update_neighbors(flat_nodes)
+            adj[other_idx] = tuple([neighbor._idx for neighbor in other.neighbors])
 
     def clear_path_nodes(self, start_node, end_node):
         """
@@ -227,10 +367,10 @@ class Grid:
             start_node (Node): The current start node.
             end_node (Node): The current end node.
         """
-        for row in self.grid_nodes:
-            for node in row:
-                if not (node.is_start() or node.is_end() or node.is_barrier()):
-                    node.reset()
+        # Open, closed and path states go back to empty in one pass over the
+        # state array; every node may have changed, so all of them get redrawn
+        self.colors[:] = self.colors.translate(CLEAR_TABLE)
+        self.dirty.update(self.flat_nodes)
         # Ensure start and end nodes retain their colors
         if start_node:
             start_node.make_start()
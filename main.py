@@ -1,8 +1,8 @@
+import math
 import pygame
 import pygame_gui
 from grid import Grid, Node
-from algorithms import bfs, dfs, dijkstra, astar
-import time
+from algorithms import bfs, dfs, dijkstra, astar, bidir_astar, FRAME_RATE
 
 # --- Constants & Globals ---
 BLACK = (0, 0, 0)
@@ -23,6 +23,8 @@ TOTAL_HEIGHT = GRID_WIDTH # Assuming square window matching grid width
 # Define the rectangle for the grid area. Used for partial updates.
 GRID_RECT = pygame.Rect(0, 0, GRID_WIDTH, TOTAL_HEIGHT)
 
+IDLE_WAIT_MS = 100 # Longest the main loop sleeps waiting for an event while nothing changes
+
 # Initialize Pygame and Font
 pygame.init()
 pygame.font.init()
@@ -35,11 +37,20 @@ pygame.display.set_caption("AI Pathfinding Visualizer")
 # Initialize Pygame GUI manager
 manager = pygame_gui.UIManager((TOTAL_WIDTH, TOTAL_HEIGHT))
 
+# Fixed labels of the stats overlay lines, rendered once; None for the status line
+STATS_LABELS = ("Visited Nodes: ", "Path Length: ", "Time Taken: ", None)
+STATS_LABEL_SURFACES = tuple(FONT.render(label, 1, BLACK) if label else None for label in STATS_LABELS)
+
 class PathfindingVisualizer:
     """
     Manages the state and data for the pathfinding visualization.
     Encapsulates grid, start/end nodes, algorithm selection, and statistics.
     """
+    __slots__ = ("rows", "grid_width", "grid_obj", "start", "end", "selected_algorithm",
+                 "last_visited_count", "last_path_length", "last_time_taken",
+                 "status_message", "paused", "grid_surface", "stats_rect",
+                 "drawn_stats_values", "_stats_cache", "_stats_surfs")
+
     def __init__(self, rows, grid_width):
         self.rows = rows
         self.grid_width = grid_width
@@ -52,6 +63,11 @@ class PathfindingVisualizer:
         self.last_time_taken = 0.0
         self.status_message = "Status: Ready"
         self.paused = [False] # Using a list for mutability when passed to algorithms
+        self.grid_surface = None # Subsurface of the window for the grid area, see get_grid_surface()
+        self.stats_rect = None # Area covered by the stats overlay when it was last drawn
+        self.drawn_stats_values = None # Values shown by the stats overlay when it was last drawn
+        self._stats_cache = [None] * len(STATS_LABELS) # Value each cached surface was rendered from
+        self._stats_surfs = [None] * len(STATS_LABELS) # Rendered value of each stats line
 
     def reset_grid(self):
         """Resets the entire grid and all state variables."""
@@ -88,28 +104,95 @@ class PathfindingVisualizer:
         self.end = node
         self.end.make_end()
 
-    def draw_stats_overlay(self, surface):
-        """Draws pathfinding statistics on the given surface."""
-        stats_text_surface_1 = FONT.render(f"Visited Nodes: {self.last_visited_count}", 1, BLACK)
-        stats_text_surface_2 = FONT.render(f"Path Length: {self.last_path_length}", 1, BLACK)
-        stats_text_surface_3 = FONT.render(f"Time Taken: {self.last_time_taken:.4f}s", 1, BLACK)
-        stats_text_surface_4 = FONT.render(self.status_message, 1, BLACK)
+    def toggle_pause(self, pause_button):
+        """Pauses or resumes the search, updating the pause button text and the status."""
+        self.paused[0] = not self.paused[0]
+        if self.paused[0]:
+            pause_button.set_text('Resume')
+            if not self.status_message.endswith(" (PAUSED)"):
+                self.status_message += " (PAUSED)"
+        else:
+            pause_button.set_text('Pause')
+            if self.status_message.endswith(" (PAUSED)"):
+                self.status_message = self.status_message.replace(" (PAUSED)", "")
+
+    def get_grid_surface(self, win):
+        """Returns the grid area subsurface of the window, created once and reused."""
+        if self.grid_surface is None or self.grid_surface.get_parent() is not win:
+            self.grid_surface = win.subsurface(GRID_RECT)
+        return self.grid_surface
+
+    def stats_values(self):
+        """Returns the variable text of each statistics overlay line (see STATS_LABELS)."""
+        return [
+            str(self.last_visited_count),
+            str(self.last_path_length),
+            f"{self.last_time_taken:.4f}s",
+            self.status_message,
+        ]
 
-        surface.blit(stats_text_surface_1, (10, 10))
-        surface.blit(stats_text_surface_2, (10, 40))
-        surface.blit(stats_text_surface_3, (10, 70))
-        surface.blit(stats_text_surface_4, (10, 100))
+    def draw_stats_overlay(self, surface):
+        """
+        Draws pathfinding statistics on the given surface.
+        Each value is only rendered again when it changed since the last call.
+        """
+        values = self.stats_values()
+        rect = None
+        for i, value in enumerate(values):
+            if value != self._stats_cache[i]:
+                self._stats_surfs[i] = FONT.render(value, 1, BLACK)
+                self._stats_cache[i] = value
+            x, y = 10, 10 + 30 * i
+            label_surface = STATS_LABEL_SURFACES[i]
+            if label_surface is not None:
+                line_rect = surface.blit(label_surface, (x, y))
+                rect = line_rect if rect is None else rect.union(line_rect)
+                x += label_surface.get_width()
+            line_rect = surface.blit(self._stats_surfs[i], (x, y))
+            rect = line_rect if rect is None else rect.union(line_rect)
+        self.stats_rect = rect
+        self.drawn_stats_values = values
 
 # --- Draw Function ---
-def draw(win, visualizer_state):
+def draw(win, visualizer_state, partial=False, update_display=True):
     """
     Draws the grid and the statistics overlay.
     This function is ONLY responsible for drawing these elements and updating
     the relevant portion of the display. It should NOT update the GUI manager
     or draw GUI elements.
+    With partial=True only the nodes that changed since the last draw are
+    redrawn, the stats overlay only when its text changed or nodes under it
+    were redrawn, and only the redrawn rects are pushed to the display.
+    With update_display=False nothing is pushed to the display; the caller
+    updates the returned rects itself.
+
+    Returns:
+        list[pygame.Rect]: The areas of the window that were drawn.
     """
-    # Create a subsurface for the grid area to draw on
-    grid_surface = win.subsurface(GRID_RECT)
+    # Subsurface for the grid area to draw on
+    grid_surface = visualizer_state.get_grid_surface(win)
+
+    if partial:
+        grid_obj = visualizer_state.grid_obj
+        stats_rect = visualizer_state.stats_rect
+        # Redrawn nodes would paint over the stats text, and changed text has to
+        # erase the old one, so repaint everything under the overlay and put
+        # the text back on top
+        redraw_stats = (stats_rect is None
+                        or visualizer_state.stats_values() != visualizer_state.drawn_stats_values
+                        or any(stats_rect.colliderect(node.x, node.y, node.size, node.size)
+                               for node in grid_obj.dirty))
+        if redraw_stats and stats_rect is not None:
+            grid_obj.mark_dirty_area(stats_rect)
+        rects = grid_obj.draw(grid_surface, partial=True)
+        if redraw_stats:
+            visualizer_state.draw_stats_overlay(grid_surface)
+            rects.append(visualizer_state.stats_rect)
+        # GRID_RECT starts at (0, 0), so grid surface rects are also window rects
+        if update_display:
+            pygame.display.update(rects)
+        return rects
+
     grid_surface.fill(WHITE) # Fill only the grid area with white
 
     visualizer_state.grid_obj.draw(grid_surface) # Draw the grid nodes and lines on this subsurface
@@ -117,8 +200,10 @@ def draw(win, visualizer_state):
     
     # IMPORTANT: Update only the grid portion of the display when called from algorithms.
     # This prevents UI elements from flickering or being cleared.
-    pygame.display.update(GRID_RECT) 
+    if update_display:
+        pygame.display.update(GRID_RECT)
     # NO manager.update() or manager.draw_ui() here! These are handled in the main loop.
+    return [GRID_RECT]
 
 
 # --- Main Loop ---
@@ -137,7 +222,7 @@ def main(win, width):
     # Dropdown for algorithm selection
     algo_dropdown_rect = pygame.Rect(10, 10, UI_WIDTH - 20, 30)
     algo_dropdown = pygame_gui.elements.UIDropDownMenu(
-        options_list=["BFS", "DFS", "Dijkstra", "A*"],
+        options_list=["BFS", "DFS", "Dijkstra", "A*", "Bidir A*"],
         starting_option=visualizer_state.selected_algorithm,
         relative_rect=algo_dropdown_rect,
         manager=manager,
@@ -199,14 +284,59 @@ def main(win, width):
         container=ui_panel
     )
 
-    while run:
-        # Calculate time_delta for pygame_gui manager update
-        time_delta = clock.tick(60)/1000.0
+    def on_search_gui_event(event):
+        """Handles GUI events while a search runs; only the pause button acts right away."""
+        if event.type == pygame_gui.UI_BUTTON_PRESSED and event.ui_element == pause_button:
+            visualizer_state.toggle_pause(pause_button)
+            return True
+        return False
+
+    # Image and position of every GUI sprite when the UI panel was last pushed to
+    # the display; pygame_gui swaps or moves sprites whenever an element changes
+    drawn_ui_state = None
+    ui_changed = True # Whether the GUI sprites changed in the previous frame
+    idle = False # True when the previous frame changed nothing and no mouse button was held
 
-        for event in pygame.event.get():
+    while run:
+        if idle:
+            # Nothing is animating: sleep until an event arrives instead of
+            # redrawing at 60 FPS, but wake up now and then for the GUI timers
+            event = pygame.event.wait(IDLE_WAIT_MS)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()
+            time_delta = clock.tick()/1000.0 # Time actually spent waiting
+        else:
+            # Calculate time_delta for pygame_gui manager update
+            time_delta = clock.tick(60)/1000.0
+            events = pygame.event.get()
+        # Poll the mouse once per frame, for the drag handling below the event loop
+        mouse_pos = pygame.mouse.get_pos()
+        mouse_buttons = pygame.mouse.get_pressed()
+        for event in events:
             if event.type == pygame.QUIT:
                 run = False
 
+            # --- Handle Mouse Clicks for Setting Start/End/Initial Barrier ---
+            if (event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3)
+                    and 0 <= event.pos[0] < GRID_WIDTH and 0 <= event.pos[1] < TOTAL_HEIGHT):
+                row, col = visualizer_state.grid_obj.get_clicked_pos(event.pos)
+                if 0 <= row < ROWS and 0 <= col < ROWS:
+                    node = visualizer_state.grid_obj.get_node(row, col)
+                    if event.button == 1: # Left click for start/end
+                        if not visualizer_state.start and node != visualizer_state.end:
+                            visualizer_state.set_start_node(node)
+                        elif not visualizer_state.end and node != visualizer_state.start:
+                            visualizer_state.set_end_node(node)
+                        # If both start and end are set, this single click will act as a barrier
+                        elif node != visualizer_state.start and node != visualizer_state.end:
+                            node.make_barrier()
+                    else: # Right click to clear start/end
+                        node.reset()
+                        if node == visualizer_state.start:
+                            visualizer_state.start = None
+                        elif node == visualizer_state.end:
+                            visualizer_state.end = None
+
             # --- Handle Pygame GUI Events ---
             if event.type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
                 if event.ui_element == algo_dropdown:
@@ -222,33 +352,34 @@ def main(win, width):
                     if visualizer_state.start and visualizer_state.end:
                         visualizer_state.clear_path() # Clear previous path/visited states for a new run
                         
-                        # Ensure neighbors are updated, especially after barrier changes
-                        visualizer_state.grid_obj.update_all_neighbors()
-                        
                         found = False
                         # Pass a lambda to the algorithm for drawing the grid.
-                        grid_draw_lambda = lambda: draw(win, visualizer_state)
+                        grid_draw_lambda = lambda: draw(win, visualizer_state, partial=True)
 
-                        start_time = time.time()
+                        start_ms = pygame.time.get_ticks()
                         
                         # Pass manager and WIN to algorithms for event processing during pause
-                        current_grid_nodes = visualizer_state.grid_obj.grid_nodes
+                        current_grid = visualizer_state.grid_obj
                         start_node = visualizer_state.start
                         end_node = visualizer_state.end
                         delay = speed_slider.get_current_value()
+                        # The delay is per search step: show enough steps per frame to fill one
+                        # frame at FRAME_RATE, e.g. 2 steps per 18 ms frame for a 9 ms delay
+                        steps_per_frame = math.ceil(1000 / FRAME_RATE / max(delay, 1))
                         paused_ref = visualizer_state.paused
 
                         if visualizer_state.selected_algorithm == "BFS":
-                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = bfs(grid_draw_lambda, current_grid_nodes, start_node, end_node, delay, paused_ref, manager, WIN)
+                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = bfs(grid_draw_lambda, current_grid, start_node, end_node, delay, paused_ref, manager, WIN, steps_per_frame, on_search_gui_event)
                         elif visualizer_state.selected_algorithm == "DFS":
-                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = dfs(grid_draw_lambda, current_grid_nodes, start_node, end_node, delay, paused_ref, manager, WIN)
+                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = dfs(grid_draw_lambda, current_grid, start_node, end_node, delay, paused_ref, manager, WIN, steps_per_frame, on_search_gui_event)
                         elif visualizer_state.selected_algorithm == "Dijkstra":
-                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = dijkstra(grid_draw_lambda, current_grid_nodes, start_node, end_node, delay, paused_ref, manager, WIN)
+                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = dijkstra(grid_draw_lambda, current_grid, start_node, end_node, delay, paused_ref, manager, WIN, steps_per_frame, on_search_gui_event)
                         elif visualizer_state.selected_algorithm == "A*":
-                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = astar(grid_draw_lambda, current_grid_nodes, start_node, end_node, delay, paused_ref, manager, WIN)
+                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = astar(grid_draw_lambda, current_grid, start_node, end_node, delay, paused_ref, manager, WIN, steps_per_frame, on_search_gui_event)
+                        elif visualizer_state.selected_algorithm == "Bidir A*":
+                            found, visualizer_state.last_visited_count, visualizer_state.last_path_length = bidir_astar(grid_draw_lambda, current_grid, start_node, end_node, delay, paused_ref, manager, WIN, steps_per_frame, on_search_gui_event)
                         
-                        end_time = time.time()
-                        visualizer_state.last_time_taken = end_time - start_time
+                        visualizer_state.last_time_taken = (pygame.time.get_ticks() - start_ms) / 1000.0
                         
                         # Set final status after algorithm completes
                         if found:
@@ -278,65 +409,57 @@ def main(win, width):
                     visualizer_state.reset_grid() # Recreate grid to clear all nodes
                 
                 elif event.ui_element == pause_button:
-                    visualizer_state.paused[0] = not visualizer_state.paused[0]
-                    if visualizer_state.paused[0]:
-                        pause_button.set_text('Resume')
-                        if not visualizer_state.status_message.endswith(" (PAUSED)"):
-                            visualizer_state.status_message += " (PAUSED)"
-                    else:
-                        pause_button.set_text('Pause')
-                        if visualizer_state.status_message.endswith(" (PAUSED)"):
-                            visualizer_state.status_message = visualizer_state.status_message.replace(" (PAUSED)", "")
+                    visualizer_state.toggle_pause(pause_button)
             
             # Process all events through the GUI manager
             manager.process_events(event)
             
-        # --- Handle Mouse Clicks for Setting Start/End/Initial Barrier ---
-        mouse_pos = pygame.mouse.get_pos()
+        # --- Handle Mouse Dragging for Drawing/Erasing Barriers (continuous) ---
         if 0 <= mouse_pos[0] < GRID_WIDTH and 0 <= mouse_pos[1] < TOTAL_HEIGHT:
-            if pygame.mouse.get_pressed()[0] and event.type == pygame.MOUSEBUTTONDOWN: # Left click for start/end
-                row, col = visualizer_state.grid_obj.get_clicked_pos(mouse_pos)
-                if 0 <= row < ROWS and 0 <= col < ROWS:
-                    node = visualizer_state.grid_obj.get_node(row, col)
-                    if not visualizer_state.start and node != visualizer_state.end:
-                        visualizer_state.set_start_node(node)
-                    elif not visualizer_state.end and node != visualizer_state.start:
-                        visualizer_state.set_end_node(node)
-                    # If both start and end are set, this single click will act as a barrier
-                    elif node != visualizer_state.start and node != visualizer_state.end:
-                        node.make_barrier()
-            elif pygame.mouse.get_pressed()[2] and event.type == pygame.MOUSEBUTTONDOWN: # Right click to clear start/end
-                 row, col = visualizer_state.grid_obj.get_clicked_pos(mouse_pos)
-                 if 0 <= row < ROWS and 0 <= col < ROWS:
-                    node = visualizer_state.grid_obj.get_node(row, col)
-                    node.reset()
-                    if node == visualizer_state.start:
-                        visualizer_state.start = None
-                    elif node == visualizer_state.end:
-                        visualizer_state.end = None
-            
-            # --- Handle Mouse Dragging for Drawing/Erasing Barriers (continuous) ---
             row, col = visualizer_state.grid_obj.get_clicked_pos(mouse_pos)
             if 0 <= row < ROWS and 0 <= col < ROWS: # Ensure position is within grid bounds
                 node = visualizer_state.grid_obj.get_node(row, col)
 
                 # Left mouse button is held down for drawing barriers
-                if pygame.mouse.get_pressed()[0]:
+                if mouse_buttons[0]:
                     if node != visualizer_state.start and node != visualizer_state.end and not node.is_barrier():
                         node.make_barrier()
                 
                 # Right mouse button is held down for erasing barriers/path
-                elif pygame.mouse.get_pressed()[2]:
+                elif mouse_buttons[2]:
                     if node != visualizer_state.start and node != visualizer_state.end:
                         node.reset()
 
 
         # --- Update and Draw ---
-        manager.update(time_delta) # Update GUI elements' internal state
-        draw(win, visualizer_state) # Draw the grid and stats overlay (updates grid portion of screen)
-        manager.draw_ui(win) # Draw the GUI elements on top of the grid and stats
-        
-        pygame.display.flip() # Update the entire display (more robust for main loop)
+        # The GUI elements only change on input, while one of them is hovered
+        # (highlights, tooltips) or held, or while a change is still settling
+        # over the following frames; otherwise walking them is wasted work
+        gui_active = (events or ui_changed or any(mouse_buttons)
+                      or manager.get_hovering_any_element())
+        if gui_active:
+            manager.update(time_delta) # Update GUI elements' internal state
+        # Redraw only the changed nodes and stats overlay, collecting their rects
+        frame_dirty = draw(win, visualizer_state, partial=True, update_display=False)
+
+        # The grid and stats never reach into the UI panel, so an idle GUI
+        # needs neither drawing nor pushing to the display
+        ui_changed = False
+        if gui_active or ui_panel_rect.collidelist(frame_dirty) != -1:
+            manager.draw_ui(win) # Draw the GUI elements on top of the grid and stats
+
+            # Push the UI panel only when the GUI may have changed: after any input,
+            # or when one of its sprites got a new image, moved or was shown/hidden
+            ui_state = [(sprite.image, tuple(sprite.rect), sprite.visible)
+                        for sprite in manager.get_sprite_group().sprites()]
+            ui_changed = ui_state != drawn_ui_state
+            if events or ui_changed:
+                frame_dirty.append(ui_panel_rect)
+                drawn_ui_state = ui_state
+
+        idle = not (events or ui_changed or frame_dirty or any(mouse_buttons))
+
+        pygame.display.update(frame_dirty) # Push only the areas drawn this frame
 
     pygame.quit()
 
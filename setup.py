@@ -0,0 +1,29 @@
+"""
+Optional build script: compiles the search cores with Cython.
+
+The search cores are plain Python, so the app runs without this step. When
+the modules are built in place (see the README), Python imports the compiled
+utils/search_core.py instead of the source, and algorithms.py switches
+Dijkstra and A* to the C versions in utils/search_core_c.pyx.
+
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup, Extension
+from Cython.Build import cythonize
+
+extensions = [
+    Extension("utils.search_core", ["utils/search_core.py"]),
+    Extension("utils.search_core_c", ["utils/search_core_c.pyx"]),
+]
+
+setup(
+    name="ai-pathfinding-visualizer",
+    ext_modules=cythonize(
+        extensions,
+        compiler_directives={
+            "boundscheck": False,
+            "wraparound": False,
+            "language_level": 3,
+        },
+    ),
+)
@@ -1,30 +1,113 @@
 import math
+from functools import lru_cache
+from itertools import product
+
+# Integer codes of the heuristic methods, for callers that pick a method once
+# and want to skip the string comparisons of h() on every call
+MANHATTAN, EUCLIDEAN, DIAGONAL = range(3)
+METHOD_CODES = {"manhattan": MANHATTAN, "euclidean": EUCLIDEAN, "diagonal": DIAGONAL}
+
+# Coordinate variants: take the four coordinates directly, without tuple unpacking
+
+def manhattan_ij(x1, y1, x2, y2):
+    """Calculates Manhattan distance between (x1, y1) and (x2, y2)."""
+    return abs(x1 - x2) + abs(y1 - y2)
+
+def euclidean_ij(x1, y1, x2, y2):
+    """Calculates Euclidean distance between (x1, y1) and (x2, y2)."""
+    dx = x1 - x2
+    dy = y1 - y2
+    return (dx * dx + dy * dy) ** 0.5
+
+def diagonal_ij(x1, y1, x2, y2):
+    """Calculates Diagonal distance (Chebyshev distance) between (x1, y1) and (x2, y2)."""
+    return max(abs(x1 - x2), abs(y1 - y2))
+
+HEURISTICS_IJ = (manhattan_ij, euclidean_ij, diagonal_ij) # Indexed by method code
 
 def manhattan(p1, p2):
     """Calculates Manhattan distance between two points."""
     x1, y1 = p1
     x2, y2 = p2
-    return abs(x1 - x2) + abs(y1 - y2)
+    return manhattan_ij(x1, y1, x2, y2)
 
 def euclidean(p1, p2):
     """Calculates Euclidean distance between two points."""
+    return math.sqrt(euclidean_sq(p1, p2))
+
+def euclidean_sq(p1, p2):
+    """
+    Calculates the squared Euclidean distance between two points.
+    It orders points the same way as euclidean() without the square root, so
+    use it to compare or sort distances. It is not a valid A* heuristic: it
+    overestimates the path cost (two cells 3 steps apart score 9), which makes
+    A* return non-shortest paths. That is also why h() has no method for it.
+    """
     x1, y1 = p1
     x2, y2 = p2
-    return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
+    dx = x1 - x2
+    dy = y1 - y2
+    return dx * dx + dy * dy
 
 def diagonal(p1, p2):
     """Calculates Diagonal distance (Chebyshev distance) between two points."""
     x1, y1 = p1
     x2, y2 = p2
-    return max(abs(x1 - x2), abs(y1 - y2))
+    return diagonal_ij(x1, y1, x2, y2)
 
 def h(p1, p2, method="manhattan"):
     """
     Generic heuristic function based on the specified method.
     Defaults to Manhattan distance.
+    The method is a name ("manhattan", "euclidean", "diagonal") or one of
+    the integer codes MANHATTAN, EUCLIDEAN and DIAGONAL.
+    """
+    if isinstance(method, str):
+        method = METHOD_CODES.get(method, MANHATTAN)
+    x1, y1 = p1
+    x2, y2 = p2
+    return HEURISTICS_IJ[method](x1, y1, x2, y2)
+
+# Index variants: cells are identified by their flat index row * cols + col and
+# their coordinates are read from precomputed per-index lists. Hot loops inline
+# the distance over these lists instead of calling a function per cell.
+
+def index_coords(rows, cols):
+    """
+    Precomputes the coordinates of every flat cell index of a grid.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+
+    Returns:
+        tuple: (row_of, col_of), two lists giving the row and column of each index.
+    """
+    row_of = [row for row in range(rows) for _ in range(cols)]
+    col_of = list(range(cols)) * rows
+    return row_of, col_of
+
+def manhattan_batch(points, goal):
+    """
+    Calculates Manhattan distance from each (x, y) point to the goal, in a
+    single list comprehension instead of a Python function call per point.
+    """
+    gx, gy = goal
+    return [abs(x - gx) + abs(y - gy) for x, y in points]
+
+@lru_cache(maxsize=1)
+def manhattan_table(rows, cols, goal_idx):
+    """
+    Manhattan distance from every flat cell index of a grid to one goal cell.
+    The last table is cached: repeated searches toward the same end cell reuse
+    it, and moving the end cell or resizing the grid builds a new one.
+
+    Args:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        goal_idx (int): Flat index of the goal cell.
+
+    Returns:
+        tuple[int]: The distance of each cell, indexed by row * cols + col.
     """
-    if method == "euclidean":
-        return euclidean(p1, p2)
-    elif method == "diagonal":
-        return diagonal(p1, p2)
-    return manhattan(p1, p2)
\ No newline at end of file
+    return tuple(manhattan_batch(product(range(rows), range(cols)), divmod(goal_idx, cols)))
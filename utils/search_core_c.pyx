@@ -0,0 +1,158 @@
+# cython: boundscheck=False, wraparound=False, language_level=3
+"""
+Compiled versions of the bucket-queue search cores (Dijkstra and A*).
+
+Same signatures, results and event order as the cores in utils/search_core.py,
+which algorithms.py falls back to when this module is not built (see setup.py).
+The scores, predecessors and the open set live in C arrays: every bucket of
+the queue is a singly linked stack of entries, so pushes and pops match the
+list append/pop of the Python version and the loop only touches Python
+objects for the neighbor tuples and the events.
+"""
+from libc.stdlib cimport malloc, realloc, free
+
+from utils.search_core import INF_SCORE
+
+
+cdef struct Buckets:
+    Py_ssize_t *head  # Most recent entry of each score, -1 if empty
+    int *cell         # Cell of each entry
+    Py_ssize_t *next  # Entry pushed before it with the same score, -1 if none
+    Py_ssize_t size
+    Py_ssize_t capacity
+
+
+cdef int buckets_push(Buckets *buckets, Py_ssize_t score, int cell) except -1:
+    cdef int *cells
+    cdef Py_ssize_t *nexts
+    if buckets.size == buckets.capacity:
+        cells = <int *> realloc(buckets.cell, 2 * buckets.capacity * sizeof(int))
+        if cells == NULL:
+            raise MemoryError()
+        buckets.cell = cells
+        nexts = <Py_ssize_t *> realloc(buckets.next, 2 * buckets.capacity * sizeof(Py_ssize_t))
+        if nexts == NULL:
+            raise MemoryError()
+        buckets.next = nexts
+        buckets.capacity *= 2
+    buckets.cell[buckets.size] = cell
+    buckets.next[buckets.size] = buckets.head[score]
+    buckets.head[score] = buckets.size
+    buckets.size += 1
+    return 0
+
+
+cdef tuple best_first(list adj, Py_ssize_t start_idx, Py_ssize_t end_idx,
+                      Py_ssize_t cols, bint use_heuristic):
+    """Dijkstra's Algorithm, or A* with the Manhattan heuristic if use_heuristic is set."""
+    cdef Py_ssize_t n = len(adj)
+    cdef Py_ssize_t current, neighbor, idx, entry
+    cdef Py_ssize_t end_row = end_idx // cols, end_col = end_idx % cols
+    # No f_score exceeds the longest path plus the largest heuristic
+    cdef Py_ssize_t max_score = n + n // cols + cols
+    cdef Py_ssize_t current_f_score
+    cdef int temp_g_score
+    cdef int inf_score = INF_SCORE
+    cdef int *g_score = NULL
+    cdef int *f_score = NULL
+    cdef int *h_table = NULL
+    cdef int *came_from = NULL
+    cdef Buckets open_set
+    cdef bint found = False
+    cdef tuple neighbors
+    cdef list events = []
+
+    open_set.head = NULL
+    open_set.cell = NULL
+    open_set.next = NULL
+    try:
+        g_score = <int *> malloc(n * sizeof(int))
+        f_score = <int *> malloc(n * sizeof(int))
+        h_table = <int *> malloc(n * sizeof(int))
+        came_from = <int *> malloc(n * sizeof(int))
+        # Every cell is pushed at most once per walkable neighbor
+        open_set.size = 0
+        open_set.capacity = 4 * n + 1
+        open_set.head = <Py_ssize_t *> malloc((max_score + 1) * sizeof(Py_ssize_t))
+        open_set.cell = <int *> malloc(open_set.capacity * sizeof(int))
+        open_set.next = <Py_ssize_t *> malloc(open_set.capacity * sizeof(Py_ssize_t))
+        if (g_score == NULL or f_score == NULL or h_table == NULL or came_from == NULL
+                or open_set.head == NULL or open_set.cell == NULL or open_set.next == NULL):
+            raise MemoryError()
+
+        for idx in range(n):
+            g_score[idx] = inf_score
+            f_score[idx] = inf_score
+            came_from[idx] = -1
+            # Dijkstra is A* with a zero heuristic
+            h_table[idx] = abs(idx // cols - end_row) + abs(idx % cols - end_col) if use_heuristic else 0
+        for idx in range(max_score + 1):
+            open_set.head[idx] = -1
+        g_score[start_idx] = 0
+        current_f_score = f_score[start_idx] = h_table[start_idx]
+        buckets_push(&open_set, current_f_score, start_idx)
+
+        while current_f_score <= max_score and not found:
+            # Pushes with the current score land on top of this stack and are
+            # popped next, like the list append/pop of the Python version
+            entry = open_set.head[current_f_score]
+            while entry != -1:
+                open_set.head[current_f_score] = open_set.next[entry]
+                current = open_set.cell[entry]
+
+                # Stale entry: a better path to this cell was pushed after it
+                if current_f_score > f_score[current]:
+                    entry = open_set.head[current_f_score]
+                    continue
+
+                if current == end_idx:
+                    found = True
+                    break
+
+                temp_g_score = g_score[current] + 1 # Same for every neighbor
+                neighbors = adj[current]
+                for neighbor in neighbors:
+                    if temp_g_score < g_score[neighbor]:
+                        if g_score[neighbor] == inf_score and neighbor != end_idx:
+                            events.append(("open", neighbor)) # First time this cell is reached
+                        came_from[neighbor] = current
+                        g_score[neighbor] = temp_g_score
+                        f_score[neighbor] = temp_g_score + h_table[neighbor]
+                        buckets_push(&open_set, f_score[neighbor], neighbor)
+
+                if current != start_idx:
+                    events.append(("closed", current))
+                entry = open_set.head[current_f_score]
+            current_f_score += 1
+
+        return found, [came_from[idx] for idx in range(n)], events
+    finally:
+        free(g_score)
+        free(f_score)
+        free(h_table)
+        free(came_from)
+        free(open_set.head)
+        free(open_set.cell)
+        free(open_set.next)
+
+
+def dijkstra_core(list adj, Py_ssize_t start_idx, Py_ssize_t end_idx, Py_ssize_t cols):
+    """
+    Dijkstra's Algorithm over the flat neighbor table (every move costs 1).
+    See utils.search_core.dijkstra_core.
+
+    Returns:
+        tuple: (found_path_boolean, came_from, events)
+    """
+    return best_first(adj, start_idx, end_idx, cols, False)
+
+
+def astar_core(list adj, Py_ssize_t start_idx, Py_ssize_t end_idx, Py_ssize_t cols):
+    """
+    A* Search over the flat neighbor table using the Manhattan heuristic.
+    See utils.search_core.astar_core.
+
+    Returns:
+        tuple: (found_path_boolean, came_from, events)
+    """
+    return best_first(adj, start_idx, end_idx, cols, True)